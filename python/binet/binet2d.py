@@ -1,18 +1,34 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from binet_cache import CACHE
+from binet_grid import adaptive, arange
 
-def plot_binet2d(x_start, x_end, step) -> None:
-    PHI = (1 + np.sqrt(5)) / 2 + 0j
-    PSI = 1 - PHI
+PHI = (1 + np.sqrt(5)) / 2 + 0j
+PSI = 1 - PHI
 
-    x = np.arange(x_start, x_end, step)
-    x = np.meshgrid(x)
 
-    f: complex = (PHI**x - PSI**x) / np.sqrt(5)
+def binet2d(x_start, x_end, step, precision="complex128", tol=None) -> np.ndarray:
+    phi = np.dtype(precision).type(PHI)
+    psi = np.dtype(precision).type(PSI)
+
+    def f(x) -> np.ndarray:
+        return ((phi**x - psi**x) / (phi - psi)).astype(precision, copy=False)
+
+    def compute() -> np.ndarray:
+        if tol is None:
+            return f(arange(x_start, x_end, step, precision))
+        (x,) = adaptive(f, [(x_start, x_end)], step, tol, precision)
+        return f(x)
+
+    return CACHE.get((x_start, x_end, None, None, step, precision, tol), compute)
+
+
+def plot_binet2d(x_start, x_end, step, precision="complex128", tol=None) -> None:
+    f = binet2d(x_start, x_end, step, precision, tol)
 
     fig, ax = plt.subplots()
-    ax.plot(f.real[0], f.imag[0])
+    ax.plot(f.real, f.imag)
     ax.set(xlabel="$f_{real}$", ylabel="$f_{imag}$")
     ax.grid()
 
@@ -1,21 +1,59 @@
+from typing import Optional, Tuple
+
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib import cm
 
+from binet_cache import CACHE
+from binet_grid import adaptive, arange
 
-def plot_binet3d(
-    x_start: float, x_end: float, y_start: float, y_end: float, step: float
-) -> None:
-    PHI: float = (1 + np.sqrt(5)) / 2 + 0j
-    PSI: float = 1 - PHI
+PHI: float = (1 + np.sqrt(5)) / 2 + 0j
+PSI: float = 1 - PHI
+
+
+def binet3d(
+    x_start: float,
+    x_end: float,
+    y_start: float,
+    y_end: float,
+    step: float,
+    precision: str = "complex128",
+    tol: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    phi = np.dtype(precision).type(PHI)
+    psi = np.dtype(precision).type(PSI)
 
-    x = np.arange(x_start, x_end, step)
-    y = np.arange(y_start, y_end, step)
-    x, y = np.meshgrid(x, y)
+    def f(y: np.ndarray, x: np.ndarray) -> np.ndarray:
+        return (
+            ((phi**x) * (phi ** (y * 1j)) - (psi**x) * (psi ** (y * 1j))) / (phi - psi)
+        ).astype(precision, copy=False)
 
-    f = ((PHI**x) * (PHI ** (y * 1j)) - (PSI**x) * (PSI ** (y * 1j))) / (PHI - PSI)
+    def compute() -> Tuple[np.ndarray, np.ndarray]:
+        if tol is None:
+            y = arange(y_start, y_end, step, precision)
+            x = arange(x_start, x_end, step, precision)
+        else:
+            # Along y the surface also moves along the y axis, so refining on
+            # the turning of f alone errs on the side of too many points there
+            y, x = adaptive(f, [(y_start, y_end), (x_start, x_end)], step, tol, precision)
+        return y, f(*np.meshgrid(y, x, indexing="ij"))
+
+    return CACHE.get((x_start, x_end, y_start, y_end, step, precision, tol), compute)
+
+
+def plot_binet3d(
+    x_start: float,
+    x_end: float,
+    y_start: float,
+    y_end: float,
+    step: float,
+    precision: str = "complex128",
+    tol: Optional[float] = None,
+) -> None:
+    y, f = binet3d(x_start, x_end, y_start, y_end, step, precision, tol)
     f_r = f.real
     f_i = f.imag
+    y = np.broadcast_to(y[:, np.newaxis], f.shape)
 
     fig, ax = plt.subplots(subplot_kw={"projection": "3d"})
     surf = ax.plot_surface(
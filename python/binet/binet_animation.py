@@ -1,6 +1,17 @@
+import os
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from queue import Empty, Full, Queue
+from threading import Event
+
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.animation import FuncAnimation, PillowWriter
+from matplotlib import rcParams
+from matplotlib.animation import FuncAnimation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
 
 PHI = (1 + np.sqrt(5)) / 2 + 0j
 PSI = 1 - PHI
@@ -9,7 +20,7 @@ PLOT = "centre"
 
 
 class Update:
-    def __init__(self, ax, x_start, x_end, step, offset=0) -> None:
+    def __init__(self, ax, x_start, x_end, step, offset=0, frames=100) -> None:
         self.ax = ax
         self.x_start = x_start
         self.x_end = x_end
@@ -19,49 +30,190 @@ class Update:
         self.f = lambda x, y: (
             PHI**x * PHI ** (y * 1j) - PSI**x * PSI ** (y * 1j)
         ) / (PHI - PSI)
-        self.fri(0 + self.offset)
-        (self.line,) = ax.plot(self.fr, self.fi, "k-")
+        self.fri(frames)
+        (self.line,) = ax.plot(self.fr[0], self.fi[0], "k-")
         self.ax.set(xlabel="$f_{real}$", ylabel="$f_{imag}$")
         self.ax.grid(True)
 
-    def fri(self, y) -> None:
-        self.fr = self.f(self.x, y).real
-        self.fi = self.f(self.x, y).imag
+    def fri(self, frames) -> None:
+        # Every frame is evaluated up front as one (frames x len(x)) array,
+        # so that the frame callbacks only have to index into it
+        y = (np.arange(frames) + self.offset) * self.step
+        f = self.f(self.x[np.newaxis, :], y[:, np.newaxis])
+        self.fr = f.real
+        self.fi = f.imag
 
     def start(self):
         return (self.line,)
 
-    def __call__(self, y):
-        y += self.offset
-        y *= self.step
-        self.fri(y)
+    def __call__(self, frame):
+        fr = self.fr[frame]
+        fi = self.fi[frame]
         if PLOT == "fix":
-            self.ax.set_xlim(min(self.fr), max(self.fr))
-            self.ax.set_ylim(min(self.fi), max(self.fi))
+            self.ax.set_xlim(fr.min(), fr.max())
+            self.ax.set_ylim(fi.min(), fi.max())
         if PLOT == "centre":
             self.ax.set_xlim(-5, 5)
             self.ax.set_ylim(-2, 2)
-        self.line.set_data(self.fr, self.fi)
+        self.line.set_data(fr, fi)
         return (self.line,)
 
 
-def animate_binet(x_start, x_end, step, offset=0):
+# Figure and Update owned by each export worker process
+_worker = None
+
+
+def _init_worker(x_start, x_end, step, offset, frames, gif) -> None:
+    global _worker
+    # A bare Figure on an Agg canvas never touches pyplot,
+    # so the workers stay headless whatever the user's backend is
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    _worker = (fig, Update(ax, x_start, x_end, step, offset, frames), gif)
+
+
+def _render_frame(frame):
+    fig, ud, gif = _worker
+    ud(frame)
+    fig.canvas.draw()
+    rgb = np.asarray(fig.canvas.buffer_rgba())[..., :3]
+    if gif:
+        # Reducing to a palette is the bulk of the GIF encoding,
+        # so it is done here in parallel rather than by the encoder
+        return Image.fromarray(rgb).convert("P", palette=Image.Palette.ADAPTIVE)
+    return rgb.copy()
+
+
+def _encode(queue, path, interval, metadata, aborted) -> None:
+    if path.lower().endswith(".gif"):
+        # Pillow can only write a GIF in one go, so the (palette) frames
+        # are kept until the end, where only the LZW compression is left
+        images = []
+        while (frame := queue.get()) is not None:
+            images.append(frame)
+        if not aborted.is_set():
+            images[0].save(
+                path, save_all=True, append_images=images[1:], duration=interval, loop=0
+            )
+        return
+    ffmpeg = None
+    while (frame := queue.get()) is not None:
+        if ffmpeg is None:
+            h, w, _ = frame.shape
+            ffmpeg = subprocess.Popen(
+                [rcParams["animation.ffmpeg_path"], "-y", "-loglevel", "error"]
+                + ["-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}"]
+                + ["-r", str(1000 / interval), "-i", "pipe:"]
+                + ["-vcodec", rcParams["animation.codec"], "-pix_fmt", "yuv420p"]
+                + [a for k, v in metadata.items() for a in ("-metadata", f"{k}={v}")]
+                + [path],
+                stdin=subprocess.PIPE,
+            )
+        ffmpeg.stdin.write(frame.tobytes())
+    if ffmpeg is not None and aborted.is_set():
+        ffmpeg.kill()
+        ffmpeg.wait()
+        if os.path.exists(path):
+            os.remove(path)
+    elif ffmpeg is not None:
+        ffmpeg.stdin.close()
+        if ffmpeg.wait():
+            raise subprocess.CalledProcessError(ffmpeg.returncode, ffmpeg.args)
+
+
+def _put(queue, frame, encoder) -> None:
+    # Don't block forever on a full queue if the encoder has died
+    while True:
+        try:
+            return queue.put(frame, timeout=1)
+        except Full:
+            if encoder.done():
+                encoder.result()
+
+
+def _abort(queue, pending, aborted) -> None:
+    aborted.set()
+    for future in pending:
+        future.cancel()
+    # Only this thread puts into the queue, so once drained
+    # there is room for the sentinel the encoder waits on
+    try:
+        while True:
+            queue.get_nowait()
+    except Empty:
+        pass
+    queue.put_nowait(None)
+
+
+def export_binet(
+    path,
+    x_start,
+    x_end,
+    step,
+    offset=0,
+    frames=100,
+    interval=100,
+    workers=None,
+    metadata=None,
+):
+    if frames < 1:
+        raise ValueError(f"frames must be at least 1, not {frames}")
+    workers = workers or os.cpu_count()
+    queue = Queue(maxsize=2 * workers)
+    with ProcessPoolExecutor(
+        workers,
+        initializer=_init_worker,
+        initargs=(x_start, x_end, step, offset, frames, path.lower().endswith(".gif")),
+    ) as pool, ThreadPoolExecutor(1) as encoding:
+        aborted = Event()
+        encoder = encoding.submit(
+            _encode, queue, path, interval, metadata or {}, aborted
+        )
+        # Frames are rendered out of order across the pool,
+        # but handed to the encoder strictly in order
+        pending = deque()
+        try:
+            for frame in range(frames):
+                pending.append(pool.submit(_render_frame, frame))
+                if len(pending) >= queue.maxsize:
+                    _put(queue, pending.popleft().result(), encoder)
+            while pending:
+                _put(queue, pending.popleft().result(), encoder)
+        except BaseException:
+            # Failed frames and Ctrl-C alike must not leave the
+            # encoder waiting, or leaving the with block hangs
+            _abort(queue, pending, aborted)
+            raise
+        _put(queue, None, encoder)
+        encoder.result()
+
+
+def animate_binet(x_start, x_end, step, offset=0, frames=100, path=None, workers=None):
+    if path is not None:
+        export_binet(
+            path,
+            x_start,
+            x_end,
+            step,
+            offset,
+            frames,
+            workers=workers,
+            metadata={"artist": "Pratik Das"},
+        )
+        return
     fig, ax = plt.subplots()
-    ud = Update(ax, x_start, x_end, step, offset)
+    ud = Update(ax, x_start, x_end, step, offset, frames)
     anim = FuncAnimation(
         fig,
         ud,
         init_func=ud.start,
-        frames=100,
+        frames=frames,
         interval=100,
         blit=True,
     )
-    anim.save(
-        ".//python//binet//binet-anim.gif",
-        metadata={"artist": "Pratik Das"},
-    )
     plt.show()
 
 
 if __name__ == "__main__":
-    animate_binet(0, 5, 0.01, -60)
+    animate_binet(0, 5, 0.01, -60, path=".//python//binet//binet-anim.gif")
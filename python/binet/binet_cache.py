@@ -0,0 +1,118 @@
+import hashlib
+import os
+from collections import OrderedDict
+from tempfile import NamedTemporaryFile
+
+import numpy as np
+
+
+def _arrays(f) -> tuple:
+    return f if isinstance(f, tuple) else (f,)
+
+
+def _nbytes(f) -> int:
+    # Memory-mapped arrays are paged in from disk by the OS,
+    # so only the others count against the budget
+    return sum(a.nbytes for a in _arrays(f) if not isinstance(a, np.memmap))
+
+
+def _mapped(f) -> int:
+    return sum(a.nbytes for a in _arrays(f) if isinstance(a, np.memmap))
+
+
+class BinetCache:
+    def __init__(self, max_bytes=512 * 2**20, directory=None, mmap=True) -> None:
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.mmap = mmap
+        self.nbytes = 0
+        self.mapped_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lru = OrderedDict()
+
+    def get(self, key, compute):
+        # key: (x_start, x_end, y_start, y_end, step, dtype, tol),
+        # with tol being None for uniform grids. compute returns
+        # either a single array or a tuple of arrays
+        if key in self._lru:
+            self.hits += 1
+            self._lru.move_to_end(key)
+            return self._lru[key]
+        f = self._load(key)
+        if f is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            f = compute()
+            self._dump(key, f)
+        # Cached fields are shared between callers, so nobody gets to mutate them
+        for a in _arrays(f):
+            a.setflags(write=False)
+        self._remember(key, f)
+        return f
+
+    def _remember(self, key, f) -> None:
+        if _nbytes(f) > self.max_bytes:
+            return
+        self._lru[key] = f
+        self.nbytes += _nbytes(f)
+        self.mapped_bytes += _mapped(f)
+        while self.nbytes > self.max_bytes:
+            _, old = self._lru.popitem(last=False)
+            self.nbytes -= _nbytes(old)
+            self.mapped_bytes -= _mapped(old)
+
+    def _path(self, key, suffix) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"binet-{digest}{suffix}")
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        mmap_mode = "r" if self.mmap else None
+        if os.path.exists(path := self._path(key, ".npy")):
+            return np.load(path, mmap_mode=mmap_mode)
+        # A tuple is stored as one .npy per array, so that
+        # every one of them can still be memory-mapped
+        arrays = []
+        while os.path.exists(path := self._path(key, f"-{len(arrays)}.npy")):
+            arrays.append(np.load(path, mmap_mode=mmap_mode))
+        return tuple(arrays) or None
+
+    def _dump(self, key, f) -> None:
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if not isinstance(f, tuple):
+            return self._save(f, self._path(key, ".npy"))
+        # Saved back to front, so that once the first array
+        # shows up, all the rest are already there
+        for i in reversed(range(len(f))):
+            self._save(f[i], self._path(key, f"-{i}.npy"))
+
+    def _save(self, a, path) -> None:
+        # Written to a temporary file first, so that a concurrent
+        # reader never sees a half written array
+        with NamedTemporaryFile(dir=self.directory, suffix=".npy", delete=False) as tmp:
+            np.save(tmp, a)
+        os.replace(tmp.name, path)
+
+    def clear(self) -> None:
+        self._lru.clear()
+        self.nbytes = 0
+        self.mapped_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "entries": len(self._lru),
+            "bytes": self.nbytes,
+            "mapped_bytes": self.mapped_bytes,
+        }
+
+
+CACHE = BinetCache(directory=os.environ.get("BINET_CACHE_DIR"))
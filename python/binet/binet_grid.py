@@ -0,0 +1,53 @@
+import numpy as np
+
+# Real dtype of the grid for each supported precision of the Binet field
+PRECISIONS = {"complex128": np.float64, "complex64": np.float32}
+
+
+def arange(start, end, step, precision="complex128") -> np.ndarray:
+    return np.arange(start, end, step, dtype=PRECISIONS[precision])
+
+
+def turning(z, axis) -> np.ndarray:
+    # Angle between successive segments of the complex curve(s) z along axis,
+    # taking the sharpest one across the other axes, one per interior point
+    d = np.diff(np.moveaxis(z, axis, -1), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.abs(np.angle(d[..., 1:] / d[..., :-1]))
+    return np.nan_to_num(a).reshape(-1, a.shape[-1]).max(axis=0)
+
+
+def refine(g, turn, tol, step) -> np.ndarray:
+    sharp = turn > tol
+    # Both segments meeting at a sharp point get split in half
+    split = np.zeros(len(g) - 1, dtype=bool)
+    split[:-1] |= sharp
+    split[1:] |= sharp
+    # Segments already down to about step are left alone, so that the
+    # grid never gets any denser than the uniform one
+    split &= np.diff(g) > step * 1.5
+    mids = (g[:-1] + g[1:])[split] / 2
+    return np.sort(np.concatenate([g, mids])).astype(g.dtype)
+
+
+def adaptive(f, bounds, step, tol, precision="complex128", coarse=16):
+    # Starts every axis out `coarse` times sparser than the uniform grid and
+    # halves the segments around points turning by more than tol radians,
+    # until the spacing is back down to step. f is called with an "ij" mesh
+    grids = []
+    for start, end in bounds:
+        fine = arange(start, end, step, precision)
+        g = fine[::coarse]
+        if len(fine) > 1 and (len(fine) - 1) % coarse:
+            g = np.append(g, fine[-1])
+        grids.append(g)
+    if any(len(g) == 0 for g in grids):
+        # Nothing to refine on an empty range, same as the uniform grid
+        return grids
+    for _ in range(int(np.log2(coarse))):
+        z = f(*np.meshgrid(*grids, indexing="ij"))
+        grids = [
+            refine(g, turning(z, axis), tol, step) if len(g) > 2 else g
+            for axis, g in enumerate(grids)
+        ]
+    return grids
@@ -80,14 +80,28 @@ Example:
     a: int = 2
     c: int
 
+9. Change Tracking:
+   - Every change made after creating the object is logged, and marks the changed object and the ones containing it as dirty.
+   - diff() lists the changed paths, once each, to_patch() gives the same as a JSON Patch (RFC 6902), and clean() starts over from the current state.
+   - to_dict() reuses the nested dicts of objects which haven't changed, so only its top level should be modified.
+
+Example:
+   ```python
+   json = JSON({"a": {"b": 1}, "c": 2})
+   json.a.b = 3
+   print(f"json.to_patch(): {json.to_patch()}")
+   json.clean()
+   ```
+
 Note: The JSON class is designed to simplify working with structured data in Python, providing a convenient way to handle JSON-like data structures with predefined keys and data types.
 """
 
 __author__ = "Pratik Das"
 
+import copy
 import types
-from typing import (Any, Dict, Iterable, Optional, Self, Tuple, TypeVar,
-                    overload)
+from typing import (Any, Dict, Iterable, List, Optional, Self, Tuple,
+                    TypeVar, overload)
 
 
 class KeyTypeError(TypeError):
@@ -101,6 +115,23 @@ class MissingError(Exception):
 class JSON:
     _VT = TypeVar("_VT")
 
+    # The bookkeeping for change tracking lives in slots,
+    # so that it never shows up as a key in __dict__
+    __slots__ = ("__dict__", "__parents", "__cached", "__changes")
+
+    def __new__(cls, *args, **kwds) -> Self:
+        # Initialised here rather than in __init__, as classes made by
+        # JSON.json may bring an __init__ of their own
+        self = object.__new__(cls)
+        # (parent, key) pairs under which this object is stored
+        object.__setattr__(self, "_JSON__parents", [])
+        # Plain dict form, None whenever this object is dirty
+        object.__setattr__(self, "_JSON__cached", None)
+        # Changes since the last clean(), root objects only, as a tree of
+        # {key: {"op", "value", "existed", "children"}} with one node per path
+        object.__setattr__(self, "_JSON__changes", {})
+        return self
+
     def __init_subclass__(cls) -> None:
         # Class variables provided with a default
         # value will be present in dir(cls),
@@ -129,6 +160,8 @@ class JSON:
             # is directly called, then self.__annotations__ will be none
             self[k] = getattr(self.__class__, k)
         self.update(map, **kwds)
+        # A newly created object is the baseline for its changes
+        self.__changes.clear()
 
     @overload
     def update(self, __map: Dict[str, _VT]) -> None:
@@ -150,14 +183,14 @@ class JSON:
         self.pop("__annotations__", None)
 
     def delkey(self, __key: str) -> None:
-        del self.__dict__[__key]
+        self._discard(__key)
 
     __delattr__ = __delitem__ = delkey
 
     def getvalue(self, __key: str) -> Optional[_VT]:
         if __key in self.__dict__:
             return self.__dict__[__key]
-        self.__dict__[__key] = None
+        self._store(__key, None)
 
     __getattr__ = __getitem__ = getvalue
 
@@ -186,10 +219,74 @@ class JSON:
             __value = types.new_class(
                 "".join(w.capitalize() for w in __key.split("_")), (JSON,)
             )(__value)
-        self.__dict__[__key] = __value
+        self._store(__key, __value)
 
     __setattr__ = __setitem__ = setvalue
 
+    def _store(self, __key: str, __value: _VT) -> None:
+        existed = __key in self.__dict__
+        if existed:
+            self._unlink(__key, self.__dict__[__key])
+        self.__dict__[__key] = __value
+        if isinstance(__value, JSON):
+            __value.__parents.append((self, __key))
+            # Whatever happened to it before, it is now
+            # recorded as a whole by this set
+            __value.__changes.clear()
+        self._changed("set", __key, __value, existed)
+
+    def _discard(self, __key: str) -> _VT:
+        __value = self.__dict__.pop(__key)
+        self._unlink(__key, __value)
+        self._changed("del", __key, None, True)
+        return __value
+
+    def _unlink(self, __key: str, __value: _VT) -> None:
+        if isinstance(__value, JSON):
+            __value.__parents[:] = [
+                (p, k) for p, k in __value.__parents if p is not self or k != __key
+            ]
+
+    def _changed(self, __op: str, __key: str, __value: Optional[_VT], __existed: bool) -> None:
+        self._record(__op, (__key,), __value, __existed)
+
+    def _record(
+        self, __op: str, __path: Tuple[str, ...], __value: Optional[_VT], __existed: bool
+    ) -> None:
+        # Dirties this object and every object above it,
+        # and logs the change with the root(s)
+        object.__setattr__(self, "_JSON__cached", None)
+        if not self.__parents:
+            self._log(__op, __path, __value, __existed)
+        for parent, key in self.__parents:
+            parent._record(__op, (key, *__path), __value, __existed)
+
+    def _log(
+        self, __op: str, __path: Tuple[str, ...], __value: Optional[_VT], __existed: bool
+    ) -> None:
+        # Merged into the tree as it comes, so that it never holds
+        # more than one change per path
+        nodes = self.__changes
+        for key in __path[:-1]:
+            node = nodes.setdefault(
+                key, {"op": None, "value": None, "existed": True, "children": {}}
+            )
+            if node["op"] == "set":
+                # The value set above is rendered as it is now,
+                # so this change is part of it already
+                return
+            nodes = node["children"]
+        key = __path[-1]
+        # Whether the key was there before the first change to it since clean()
+        if key in nodes:
+            __existed = nodes[key]["existed"]
+        if __op == "del" and not __existed:
+            # Added and removed again, which leaves nothing to report
+            nodes.pop(key, None)
+            return
+        # Whatever changed below this path is superseded by this change
+        nodes[key] = {"op": __op, "value": __value, "existed": __existed, "children": {}}
+
     def __len__(self) -> int:
         return len(self.__dict__)
 
@@ -204,7 +301,8 @@ class JSON:
         return self.__copy__()
 
     def clear(self) -> None:
-        self.__dict__.clear()
+        for key in list(self.__dict__):
+            self._discard(key)
 
     @overload
     def get(self, __key: str) -> Optional[_VT]:
@@ -230,9 +328,14 @@ class JSON:
     def pop(self, __key: str, __default: _VT) -> Optional[_VT]: ...
 
     def pop(self, __key: str, __default: Optional[_VT] = None) -> _VT:
-        return self.__dict__.pop(__key, __default)
+        if __key in self.__dict__:
+            return self._discard(__key)
+        return __default
 
     def popitem(self) -> Tuple[str, _VT]:
+        for key in reversed(self.__dict__):
+            return key, self._discard(key)
+        # Only reached when empty, to raise the usual KeyError
         return self.__dict__.popitem()
 
     @overload
@@ -244,7 +347,9 @@ class JSON:
         ...
 
     def setdefault(self, __key: str, __default: Optional[_VT] = None) -> Optional[_VT]:
-        return self.__dict__.setdefault(__key, __default)
+        if __key not in self.__dict__:
+            self._store(__key, __default)
+        return self.__dict__[__key]
 
     def values(self) -> Iterable[_VT]:
         return self.to_dict().values()
@@ -254,7 +359,7 @@ class JSON:
 
     def join(self, __other: Self) -> Self:
         for k, v in __other.__dict__.items():
-            self.__dict__[k] = v
+            self._store(k, v)
         return self
 
     __or__ = __ior__ = join
@@ -308,7 +413,53 @@ class JSON:
         return JSON(map, **kwds)
 
     def to_dict(self) -> Dict[str, Any]:
-        return {k: v.to_dict() if isinstance(v, JSON) else v for k, v in self.__dict__.items()}
+        """
+        The returned dict is the caller's own, but the dicts nested in it are
+        reused by later calls for as long as the objects they came from don't
+        change, so those must be treated as read-only.
+        """
+        return dict(self._plain())
+
+    def _plain(self) -> Dict[str, Any]:
+        # The cached dict itself, which changes to this object replace
+        # rather than modify, so dicts handed out earlier stay as they were
+        if self.__cached is None:
+            object.__setattr__(
+                self,
+                "_JSON__cached",
+                {k: v._plain() if isinstance(v, JSON) else v for k, v in self.__dict__.items()},
+            )
+        return self.__cached
+
+    def diff(self) -> List[Tuple[str, Tuple[str, ...], Any]]:
+        changes = []
+        stack = [((), self.__changes)]
+        while stack:
+            path, nodes = stack.pop()
+            for key, node in nodes.items():
+                if node["op"] is not None:
+                    value = node["value"]
+                    changes.append(
+                        (node["op"], (*path, key), value.to_dict() if isinstance(value, JSON) else value)
+                    )
+                stack.append(((*path, key), node["children"]))
+        return changes
+
+    def to_patch(self) -> List[Dict[str, Any]]:
+        patch = []
+        for op, path, value in self.diff():
+            pointer = "".join(
+                "/" + k.replace("~", "~0").replace("/", "~1") for k in path
+            )
+            if op == "set":
+                # "add" replaces an existing member of an object as well
+                patch.append({"op": "add", "path": pointer, "value": value})
+            else:
+                patch.append({"op": "remove", "path": pointer})
+        return patch
+
+    def clean(self) -> None:
+        self.__changes.clear()
 
     @staticmethod
     def json(__cls: type) -> type:
@@ -378,3 +529,42 @@ if __name__ == "__main__":
     print("@JSON.json\nclass Packet:\n    a: int = 2\n    c: int")
     print(f"{Packet(a=6, b=5)=}")
     print(f"{Packet({"c": 3})=}")
+
+    print("\nChanges are tracked, and can be sent as a JSON Patch")
+    print(f"{(doc := JSON({"x": 1, "a": {"b": 1, "c": 2}}))=}")
+    before = doc.to_dict()
+    doc.a.b = 3
+    doc.n = {"m": 1}
+    del doc.n.m
+    doc.y = 4
+    del doc.y
+    del doc.x
+    print(f"{doc.diff()=}")
+    print(f"{(patch := doc.to_patch())=}")
+
+    def apply_patch(map: Dict[str, Any], patch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        map = copy.deepcopy(map)
+        for op in patch:
+            *parents, key = (
+                k.replace("~1", "/").replace("~0", "~") for k in op["path"].split("/")[1:]
+            )
+            node = map
+            for k in parents:
+                node = node[k]
+            if op["op"] == "add":
+                node[key] = op["value"]
+            else:
+                del node[key]
+        return map
+
+    # The patch takes the old dict to the current one
+    assert apply_patch(before, patch) == doc.to_dict()
+    print(f"{apply_patch(before, patch) == doc.to_dict()=}")
+
+    # Dicts handed out earlier don't change along with the object,
+    # nor does the object change along with them
+    assert before == {"x": 1, "a": {"b": 1, "c": 2}}
+    after = doc.to_dict()
+    after["a"] = None
+    assert doc.to_dict()["a"] == {"b": 3, "c": 2}
+    print(f"{before=}\n{doc.to_dict()=}")
@@ -51,13 +51,31 @@ Example:
 Example:
    - You can use standard dictionary methods like len(d), 'in' operator, etc.
 
+7. Multiprocessing:
+   - A SequencedDict pickles as one list of keys and one of values, and is rebuilt without going through __setitem__.
+   - share() places the keys and values in shared memory and returns a read-only SharedSequencedDict over it, which pickles as just the name of the block.
+   - attach(name) opens that block in another process. The process that called share() closes and unlinks it, e.g. by using it as a context manager.
+   - The values are only unpickled when accessed, but the keys are unpickled and indexed in full by the first attach in each process. Later attaches in that process reuse the same SharedSequencedDict.
+
+Example:
+   with d.share() as shared:
+       pool.map(work, [shared] * 4)
+
 Note: This class is a convenient way to work with dictionaries while keeping track of the order of keys and offering advanced slicing and indexing capabilities.
 """
 
 __author__ = "Pratik Das"
 
+import copy
+import pickle
+import struct
+from array import array
 from collections import UserDict
-from typing import Dict, List, Optional, TypeVar, Union, overload, override
+from collections.abc import Mapping
+from itertools import accumulate
+from multiprocessing.shared_memory import SharedMemory
+from typing import (Any, Dict, Iterator, List, Optional, Self, Tuple, TypeVar,
+                    Union, overload, override)
 
 _KT = TypeVar("_KT")
 _VT = TypeVar("_VT")
@@ -82,9 +100,11 @@ class SequencedDict(UserDict):
 
     @override
     def __setitem__(self, __key: _KT, __item: _VT) -> None:
-        UserDict.__setitem__(self, __key, __item)
-        if __key not in self.__keys:
+        # self.data holds the same keys as self.__keys,
+        # without the linear search of the list
+        if __key not in self.data:
             self.__keys.append(__key)
+        UserDict.__setitem__(self, __key, __item)
 
     @overload
     def __getitem__(self, __key: int) -> Dict[_KT, _VT]:
@@ -132,21 +152,185 @@ class SequencedDict(UserDict):
 
     @override
     def __delitem__(self, __key: Union[_KT, int, slice]) -> None:
-        try:
+        # Same lookup order as __getitem__, keys first, and
+        # self.data and self.__keys always lose the same keys
+        if not isinstance(__key, slice) and __key in self.data:
             del self.data[__key]
-            del self.__keys[__key]
-        except KeyError:
-            if isinstance(__key, int) and __key < len(self):
-                k: _KT = self.__keys[__key]
+            self.__keys.remove(__key)
+        elif isinstance(__key, int) and __key < len(self):
+            k: _KT = self.__keys.pop(__key)
+            del self.data[k]
+        elif isinstance(__key, slice):
+            ks: List[_KT] = self.__keys[__key]
+            for k in ks:
                 del self.data[k]
-                del self.__keys[k]
-            if isinstance(__key, slice):
-                ks: List[_KT] = self.__keys[__key]
-                for k in ks:
-                    del self.data[k]
-                    del self.__keys[k]
+            del self.__keys[__key]
+        else:
             raise KeyError(__key)
 
+    @override
+    def __copy__(self) -> Self:
+        # UserDict.__copy__ would share self.__keys with the copy
+        inst = UserDict.__copy__(self)
+        inst.__keys = list(self.__keys)
+        return inst
+
+    @override
+    def copy(self) -> Self:
+        # UserDict.copy refills the copy through __setitem__,
+        # which is neither needed nor safe with the keys copied
+        return self.__copy__()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Pickled as two flat lists, and rebuilt without going
+        # through __setitem__ for every single item
+        state = {
+            k: v for k, v in vars(self).items() if k not in ("data", "_SequencedDict__keys")
+        }
+        return (
+            _rebuild,
+            (self.__class__, self.__keys, [self.data[k] for k in self.__keys]),
+            state or None,
+        )
+
+    def share(self) -> "SharedSequencedDict":
+        # Layout of the block: the item count, N + 2 offsets, then the
+        # pickled list of keys followed by every value pickled on its own
+        blobs = [pickle.dumps(self.__keys, pickle.HIGHEST_PROTOCOL)]
+        blobs.extend(pickle.dumps(self.data[k], pickle.HIGHEST_PROTOCOL) for k in self.__keys)
+        header = array("Q", [len(self.__keys)])
+        header.extend(accumulate(map(len, blobs), initial=0))
+        body = b"".join(blobs)
+        shm = SharedMemory(create=True, size=header.itemsize * len(header) + len(body))
+        try:
+            shm.buf[: header.itemsize * len(header)] = header.tobytes()
+            shm.buf[header.itemsize * len(header) :] = body
+            return SharedSequencedDict(shm, owner=True)
+        except BaseException:
+            # Nobody else knows about the block yet, so it would leak
+            shm.close()
+            shm.unlink()
+            raise
+
+    @staticmethod
+    def attach(__name: str) -> "SharedSequencedDict":
+        # Indexing the keys is the costly part of attaching,
+        # so every process does it once per block
+        if (view := _attached.get(__name)) is not None:
+            return view
+        try:
+            # Only the process which shared the block may unlink it
+            shm = SharedMemory(__name, track=False)
+        except TypeError:  # track was added in Python 3.13
+            shm = SharedMemory(__name)
+        view = _attached[__name] = SharedSequencedDict(shm)
+        return view
+
+
+# Blocks attached to by this process, by name
+_attached: Dict[str, "SharedSequencedDict"] = {}
+
+
+def _rebuild(cls: type, keys: List[_KT], values: List[_VT]) -> SequencedDict:
+    self = cls.__new__(cls)
+    self.data = dict(zip(keys, values))
+    self._SequencedDict__keys = keys
+    return self
+
+
+class SharedSequencedDict(Mapping):
+    """Read-only SequencedDict over a shared memory block, made by SequencedDict.share()
+    and opened in other processes by SequencedDict.attach(name). Pickling it only sends
+    the name of the block. The values are unpickled straight from the block on access,
+    while the keys are unpickled and indexed up front, once per process."""
+
+    def __init__(self, shm: SharedMemory, owner: bool = False) -> None:
+        self.shm = shm
+        self.owner = owner
+        (n,) = struct.unpack_from("Q", shm.buf)
+        self._offsets = shm.buf[8 : 8 * (n + 3)].cast("Q")
+        self._body = shm.buf[8 * (n + 3) :]
+        try:
+            self.__keys: List[_KT] = self._load(0)
+        except BaseException:
+            # Otherwise the views keep the block from being closed
+            self._release()
+            raise
+        self._index: Dict[_KT, int] = {k: i for i, k in enumerate(self.__keys)}
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _load(self, __i: int) -> Any:
+        return pickle.loads(self._body[self._offsets[__i] : self._offsets[__i + 1]])
+
+    def _value(self, __key: _KT) -> _VT:
+        return self._load(1 + self._index[__key])
+
+    @overload
+    def __getitem__(self, __key: int) -> Dict[_KT, _VT]:
+        ...
+
+    @overload
+    def __getitem__(self, __key: slice) -> Dict[_KT, _VT]:
+        ...
+
+    @overload
+    def __getitem__(self, __key: _KT) -> _VT:
+        ...
+
+    def __getitem__(self, __key: Union[_KT, int, slice]) -> Union[_VT, Dict[_KT, _VT]]:
+        # Same lookup order as SequencedDict, keys first
+        if not isinstance(__key, slice) and __key in self._index:
+            return self._value(__key)
+        if isinstance(__key, int) and __key < len(self):
+            k: _KT = self.__keys[__key]
+            return {k: self._value(k)}
+        if isinstance(__key, slice):
+            return {k: self._value(k) for k in self.__keys[__key]}
+        raise KeyError(__key)
+
+    def __contains__(self, __key: object) -> bool:
+        return __key in self._index
+
+    def __iter__(self) -> Iterator[_KT]:
+        return iter(self.__keys)
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (SequencedDict.attach, (self.name,))
+
+    def _release(self) -> None:
+        # The views into the block have to go before it can be closed
+        self._offsets.release()
+        self._body.release()
+
+    def close(self) -> None:
+        if _attached.get(self.name) is self:
+            del _attached[self.name]
+        self._release()
+        self.shm.close()
+
+    def __del__(self) -> None:
+        # Likewise before the block gets closed on garbage collection
+        if hasattr(self, "_body"):
+            self._release()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
 if __name__ == "__main__":
     print(f"{(d := SequencedDict({"a": 1, "b": 2}, c=3))=}")
     print(f"{d['a']=}")
@@ -154,3 +338,10 @@ if __name__ == "__main__":
     print(f"{d[-1]=}")
     print(f"{d[1:]=}")
     print(f"{d[:4]=}")
+
+    # Copies get keys of their own, and leave d as it was
+    c = d.copy()
+    c["e"] = 5
+    copy.copy(d)["f"] = 6
+    assert list(d) == ["a", "b", "c"] and d[3:] == {}
+    print(f"{d.copy()=}\n{c=}")
@@ -0,0 +1,59 @@
+"""
+Benchmark: handing a SequencedDict to a multiprocessing pool
+
+Times a pool of 1 to N processes, each looking up every 1000th key, once with the SequencedDict pickled to every worker and once with a shared, read-only copy from SequencedDict.share().
+The cost of attaching to the shared copy is reported on its own, both for the first attach in a worker, which indexes the keys, and for the later ones, which reuse it.
+
+Usage:
+   python sequenced_dict_benchmark.py [items] [processes]
+"""
+
+__author__ = "Pratik Das"
+
+import os
+import sys
+import time
+from collections.abc import Mapping
+from multiprocessing.pool import Pool
+
+from sequenced_dict import SequencedDict
+
+
+def work(d: Mapping) -> int:
+    return sum(len(d[k]) for k in range(0, len(d), 1000))
+
+
+def attach(name: str) -> float:
+    start = time.perf_counter()
+    SequencedDict.attach(name)
+    return time.perf_counter() - start
+
+
+def bench(pool: Pool, d: Mapping, processes: int) -> float:
+    start = time.perf_counter()
+    pool.map(work, [d] * processes, chunksize=1)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    d = SequencedDict({i: str(i) for i in range(items)})
+    start = time.perf_counter()
+    shared = d.share()
+    print(f"share(): {time.perf_counter() - start:.3f}s for {items} items")
+
+    with shared:
+        print(f"{'processes':>9} {'pickled':>9} {'attach':>9} {'reattach':>9} {'shared':>9}")
+        for p in range(1, processes + 1):
+            with Pool(p) as pool:
+                pool.map(len, [()] * p)  # Warm up the workers first
+                pickled = bench(pool, d, p)
+                # Per task, in workers which haven't attached yet,
+                # so the slowest is a first attach and the fastest a reuse
+                attaches = pool.map(attach, [shared.name] * 4 * p, chunksize=1)
+                print(
+                    f"{p:>9} {pickled:>8.3f}s {max(attaches):>8.3f}s"
+                    f" {min(attaches):>8.6f}s {bench(pool, shared, p):>8.3f}s"
+                )